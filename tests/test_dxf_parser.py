@@ -0,0 +1,65 @@
+import pytest
+
+ezdxf = pytest.importorskip("ezdxf")
+np = pytest.importorskip("numpy")
+
+from v2g_audit.dxf_parser import parse_dxf
+from v2g_audit.geometry import arc_endpoints
+from v2g_audit.symbols import SymbolMatcher
+
+MATCHER = SymbolMatcher({"GROUND": ["GND"], "CT": ["CT"]})
+
+
+def _parse(doc, tmp_path):
+    path = str(tmp_path / "case.dxf")
+    doc.saveas(path)
+    return parse_dxf(path, [], [], MATCHER)
+
+
+def test_modelspace_polylines(tmp_path):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_polyline2d([(0, 0), (10, 0), (10, 10)])
+    msp.add_polyline3d([(0, 20, 0), (10, 20, 5)])
+    prims = _parse(doc, tmp_path)
+    pts = sorted(p.data["points"].tolist() for p in prims["POLYLINE"])
+    assert pts == [[[0, 0], [10, 0], [10, 10]], [[0, 20], [10, 20]]]
+
+
+def test_polyline_skips_spline_frame_control_points(tmp_path):
+    doc = ezdxf.new()
+    pl = doc.modelspace().add_polyline2d([(0, 0), (10, 0)])
+    pl.append_vertex((5, 5), dxfattribs={"flags": 16})
+    prims = _parse(doc, tmp_path)
+    assert prims["POLYLINE"][0].data["points"].tolist() == [[0, 0], [10, 0]]
+
+
+def test_block_polyline_does_not_hide_nested_symbols(tmp_path):
+    doc = ezdxf.new()
+    gnd = doc.blocks.new(name="GND")
+    gnd.add_line((0, 0), (0, -5))
+    sym = doc.blocks.new(name="SYM")
+    sym.add_polyline2d([(0, 0), (5, 0), (5, 5)])
+    sym.add_arc((0, 0), 2, 0, 180)
+    sym.add_blockref("GND", (0, 0))
+    doc.modelspace().add_blockref("SYM", (100, 100))
+    prims = _parse(doc, tmp_path)
+    assert [p.data["label"] for p in prims["INSERT"]] == [None, "GROUND"]
+    assert len(prims["LINE"]) == 1
+    # block-internal arcs / polylines are symbol outlines, not wires
+    assert prims["POLYLINE"] == [] and prims["ARC"] == []
+
+
+def test_mirrored_entities_use_wcs(tmp_path):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_arc((10, 0), 5, 0, 90, dxfattribs={"extrusion": (0, 0, -1)})
+    msp.add_lwpolyline([(0, 0), (10, 0)], dxfattribs={"extrusion": (0, 0, -1)})
+    prims = _parse(doc, tmp_path)
+
+    arc = prims["ARC"][0].data
+    a, b = arc_endpoints([arc["center"]], [arc["r"]], [arc["start_angle"]], [arc["end_angle"]])
+    ends = sorted(tuple(np.round(p, 6)) for p in (a[0], b[0]))
+    assert ends == [(-15.0, 0.0), (-10.0, 5.0)]
+
+    assert np.allclose(prims["LWPOLYLINE"][0].data["points"], [[0, 0], [-10, 0]])
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("ezdxf")
+pytest.importorskip("scipy")
+
+from v2g_audit.dxf_parser import DXFPrimitive
+from v2g_audit.geometry import Point, Segment
+from v2g_audit.graph_builder import build_property_graph, wire_endpoints, endpoint_merge_tree, cut_merge_tree
+from v2g_audit.symbols import SymbolMatcher
+
+MATCHER = SymbolMatcher({})
+
+
+def _parallel_wires(n=6, pitch=4.0, length=100.0):
+    lines = [DXFPrimitive("LINE", {"layer": "0", "segment": Segment(Point(i * pitch, 0.0), Point(i * pitch, length))})
+             for i in range(n)]
+    return {"LINE": lines, "INSERT": [], "TEXT": [], "ARC": [], "LWPOLYLINE": [], "POLYLINE": []}
+
+
+def _endpoints(graph):
+    return [n for n in graph["nodes"] if n["type"] == "ENDPOINT"]
+
+
+def test_default_clustering_is_greedy():
+    # greedy snapping pairs neighbouring wires but does not chain all six together
+    graph = build_property_graph(_parallel_wires(), MATCHER, 5.0, 5.0, 3.0)
+    assert len(_endpoints(graph)) == 6
+
+
+def test_single_linkage_is_opt_in_and_matches_sweep_cut():
+    prims = _parallel_wires()
+    graph = build_property_graph(prims, MATCHER, 5.0, 5.0, 3.0, endpoint_clustering="single_linkage")
+    assert len(_endpoints(graph)) == 2
+
+    pts = wire_endpoints(prims)
+    labels = cut_merge_tree(len(pts), endpoint_merge_tree(pts, 20.0), 5.0)
+    assert build_property_graph(prims, MATCHER, 5.0, 5.0, 3.0, endpoint_labels=labels) == graph
+
+
+def test_unknown_clustering_rejected():
+    with pytest.raises(ValueError):
+        build_property_graph(_parallel_wires(), MATCHER, 5.0, 5.0, 3.0, endpoint_clustering="average")
@@ -0,0 +1,60 @@
+import math
+import random
+import pytest
+
+pytest.importorskip("ezdxf")
+pytest.importorskip("networkx")
+
+from v2g_audit.graph_store import GraphStore
+
+
+def _store(n_drawings=60, n_nodes=300, seed=0):
+    rng = random.Random(seed)
+    store = GraphStore(":memory:")
+    for d in range(n_drawings):
+        nodes = []
+        for i in range(n_nodes):
+            t = "CT" if i < 3 else "GROUND" if i < 8 else "ENDPOINT"
+            attrs = {"texts": ["CT 1", "ct"]} if i == 0 else {}
+            nodes.append({"id": f"N{i}", "type": t, "x": rng.uniform(0, 500), "y": rng.uniform(0, 500), "attrs": attrs})
+        store.add_graph(f"dwg{d}", {"nodes": nodes, "edges": [{"u": "N0", "v": "N1", "attrs": {"kind": "WIRE"}}]})
+    store.conn.execute("ANALYZE")
+    return store
+
+
+def _plan(store, sql, params):
+    return [row[-1] for row in store.conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def test_find_nodes_by_token_is_driven_by_token_index():
+    store = _store()
+    hits = store.find_nodes(token="CT")
+    assert len(hits) == 60 and all(h["id"] == "N0" for h in hits)
+    plan = _plan(store, *store._find_nodes_sql(token="ct"))
+    assert plan[0].startswith("SEARCH t USING COVERING INDEX idx_text_tokens_lookup")
+    assert not any(p.startswith("SCAN n") for p in plan)
+
+
+def test_find_nodes_bbox_includes_points_on_the_edge():
+    store = GraphStore(":memory:")
+    store.add_graph("edge", {"nodes": [{"id": "E", "type": "X", "x": 0.1, "y": 0.1, "attrs": {}}], "edges": []})
+    assert [n["id"] for n in store.find_nodes(bbox=(0.1, 0.1, 0.2, 0.2))] == ["E"]
+    assert store.find_nodes(bbox=(0.1, 0.1, 0.2, 0.2), drawing="other") == []
+
+
+def test_nodes_near_matches_brute_force():
+    store = _store()
+    got = sorted((h["drawing"], h["id"], h["anchor"]) for h in store.nodes_near("GROUND", "CT", 40.0))
+    rows = store.conn.execute("SELECT d.name, n.node_id, n.type, n.x, n.y FROM nodes n "
+                              "JOIN drawings d ON d.id = n.drawing_id WHERE n.type IN ('CT', 'GROUND')").fetchall()
+    want = sorted((d, g, a) for d, g, tg, gx, gy in rows if tg == "GROUND"
+                  for d2, a, ta, ax, ay in rows if ta == "CT" and d2 == d and math.hypot(gx - ax, gy - ay) <= 40.0)
+    assert got == want and got
+
+
+def test_load_graph_roundtrip():
+    store = _store(n_drawings=1, n_nodes=10)
+    g = store.load_graph("dwg0")
+    assert len(g["nodes"]) == 10 and g["edges"] == [{"u": "N0", "v": "N1", "attrs": {"kind": "WIRE"}}]
+    assert store.load_graph("dwg0", "n.type = ?", ["CT"])["edges"] == [{"u": "N0", "v": "N1", "attrs": {"kind": "WIRE"}}]
+    assert store.load_graph("dwg0", "n.type = ?", ["GROUND"])["edges"] == []
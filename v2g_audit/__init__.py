@@ -3,4 +3,5 @@ from .dxf_parser import parse_dxf
 from .graph_builder import build_property_graph
 from .gsp_verify import GSPVerifier
 from .rules import RuleEngine
-from .report import write_reports
\ No newline at end of file
+from .report import write_reports
+from .graph_store import GraphStore
\ No newline at end of file
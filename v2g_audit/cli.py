@@ -5,7 +5,10 @@ from .dxf_parser import parse_dxf
 from .graph_builder import build_property_graph
 from .gsp_verify import GSPVerifier
 from .rules import RuleEngine
-from .report import write_reports
+from .report import write_reports, write_variant_reports, write_sweep_report
+from .variants import evaluate_variants
+from .graph_store import GraphStore
+from .tolerance_sweep import sweep_tolerance
 
 def main():
     ap = argparse.ArgumentParser(description="V2G-style DXF schematic auditor")
@@ -14,7 +17,22 @@ def main():
     ap.add_argument("--rules", required=True, help="Path to rules JSON")
     ap.add_argument("--out", required=True, help="Output directory")
     ap.add_argument("--tau", type=float, default=None, help="Override endpoint snap tolerance")
+    ap.add_argument("--variants", type=int, default=0, help="Also evaluate N in-memory rotated/translated/noisy variants")
+    ap.add_argument("--seed", type=int, default=0, help="Random seed for variant generation")
+    ap.add_argument("--max-shift", type=float, default=100.0, help="Max variant translation per axis (drawing units)")
+    ap.add_argument("--noise", type=float, default=0.0, help="Std-dev of gaussian coordinate noise for variants")
+    ap.add_argument("--sweep", default=None, help="Comma-separated endpoint snap tolerances to sweep, e.g. 0.5,1,2,5")
+    ap.add_argument("--db", default=None, help="Also store the graph(s) in this SQLite graph store")
     args = ap.parse_args()
+    if args.sweep is not None:
+        try:
+            taus = [float(t) for t in args.sweep.split(",") if t.strip()]
+        except ValueError:
+            ap.error(f"--sweep expects comma-separated numbers, got {args.sweep!r}")
+        if not taus:
+            ap.error("--sweep needs at least one tolerance")
+        if any(t <= 0 for t in taus):
+            ap.error("--sweep tolerances must be > 0")
 
     cfg = load_config(args.config)
     if args.tau is not None:
@@ -23,16 +41,46 @@ def main():
     matcher = SymbolMatcher(cfg.symbols.patterns)
     prims = parse_dxf(args.dxf, cfg.layers.include, cfg.layers.exclude, matcher)
 
-    graph = build_property_graph(prims, matcher, cfg.tolerance.tau_endpoint_snap, cfg.tolerance.tau_junction_snap, cfg.text.attach_distance)
+    with open(args.rules, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+
+    if args.sweep is not None:
+        sweep = sweep_tolerance(prims, matcher, rules, taus, cfg.tolerance.tau_junction_snap, cfg.text.attach_distance)
+        write_sweep_report(sweep, args.out)
+        print(f"Done. Swept {len(sweep['taus'])} tolerances ({sweep['clustering']} endpoint clustering), "
+              f"recommended tau: {sweep['recommended_tau']}. Outputs saved to {args.out}")
+        if cfg.tolerance.endpoint_clustering != sweep["clustering"]:
+            print(f"Note: config uses '{cfg.tolerance.endpoint_clustering}' endpoint clustering; set "
+                  f"tolerance.endpoint_clustering: {sweep['clustering']} for runs to match the sweep.")
+        return
+
+    if args.variants > 0:
+        evaluation = evaluate_variants(prims, matcher, rules, cfg.tolerance.tau_endpoint_snap,
+                                       cfg.tolerance.tau_junction_snap, cfg.text.attach_distance,
+                                       args.variants, args.seed, args.max_shift, args.noise,
+                                       cfg.tolerance.endpoint_clustering)
+        write_variant_reports(evaluation, args.out)
+        if args.db:
+            drawing = os.path.splitext(os.path.basename(args.dxf))[0]
+            with GraphStore(args.db) as store:
+                store.add_graph(drawing, evaluation["base"]["graph"])
+                for v in evaluation["variants"]:
+                    store.add_graph(f"{drawing}#v{v['variant']:03d}", v["graph"])
+        unstable = evaluation["invariance"]["unstable"]
+        print(f"Done. {args.variants} variants evaluated, unstable rules: {unstable or 'none'}. Outputs saved to {args.out}")
+        return
+
+    graph = build_property_graph(prims, matcher, cfg.tolerance.tau_endpoint_snap, cfg.tolerance.tau_junction_snap, cfg.text.attach_distance,
+                                 endpoint_clustering=cfg.tolerance.endpoint_clustering)
 
     verifier = GSPVerifier(graph)
     engine = RuleEngine(verifier)
-
-    with open(args.rules, "r", encoding="utf-8") as f:
-        rules = json.load(f)
     results = engine.run(rules)
 
     write_reports(graph, results, args.out)
+    if args.db:
+        with GraphStore(args.db) as store:
+            store.add_graph(os.path.splitext(os.path.basename(args.dxf))[0], graph)
     print(f"Done. Outputs saved to {args.out}")
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ from typing import Dict, List, Any
 class Tolerance:
     tau_endpoint_snap: float = 2.0
     tau_junction_snap: float = 2.0
+    endpoint_clustering: str = "greedy"     # or "single_linkage" (what --sweep measures)
 
 @dataclass
 class LayerConfig:
@@ -2,11 +2,13 @@ from typing import Dict, Any, List, Tuple, Optional
 from dataclasses import dataclass
 from .geometry import Point, Segment
 from .symbols import SymbolMatcher
+import math
+import numpy as np
 import ezdxf
 
 @dataclass
 class DXFPrimitive:
-    kind: str                # 'LINE', 'ARC', 'TEXT', 'INSERT'
+    kind: str                # 'LINE', 'ARC', 'LWPOLYLINE', 'POLYLINE', 'TEXT', 'INSERT'
     data: Dict[str, Any]     # raw fields
 
 def _layer_ok(name: str, include: list, exclude: list) -> bool:
@@ -14,6 +16,70 @@ def _layer_ok(name: str, include: list, exclude: list) -> bool:
     if exclude and name in exclude: return False
     return True
 
+def _handle(entity) -> Optional[str]:
+    # Virtual (block-expanded) entities carry no handle
+    return getattr(entity.dxf, "handle", None)
+
+def _mirrored(entity) -> bool:
+    # MIRROR produces extrusion (0,0,-1): OCS x-axis points to -X and OCS counter-clockwise is WCS clockwise
+    return entity.dxf.get("extrusion", (0.0, 0.0, 1.0))[2] < 0
+
+def _polyline_data(entity, layer: str) -> Optional[Dict[str, Any]]:
+    """WCS vertex array (n,2), bulge array (n,) and closed flag of a LWPOLYLINE / 2D or 3D POLYLINE."""
+    if entity.dxftype() == "LWPOLYLINE":
+        xy = [(p.x, p.y) for p in entity.vertices_in_wcs()]
+        bulges = [b for *_, b in entity.get_points("b")]
+        closed = bool(entity.closed)
+        flip = _mirrored(entity)
+    else:
+        # polyface / mesh POLYLINEs are not wires
+        if not (entity.is_2d_polyline or entity.is_3d_polyline):
+            return None
+        # spline-frame control points only shape the fitted curve, they are not on the wire
+        verts = [v for v in entity.vertices if not (v.dxf.flags & v.SPLINE_FRAME_CONTROL_POINT)]
+        locs = [v.dxf.location for v in verts]
+        if entity.is_2d_polyline:
+            locs = entity.ocs().points_to_wcs(locs)
+        xy = [(p.x, p.y) for p in locs]
+        bulges = [v.dxf.get("bulge", 0.0) for v in verts]
+        closed = bool(entity.is_closed)
+        flip = entity.is_2d_polyline and _mirrored(entity)
+    if len(xy) < 2:
+        return None
+    bulges = np.asarray(bulges, dtype=float)
+    return {"layer": layer, "handle": _handle(entity), "points": np.asarray(xy, dtype=float).reshape(-1, 2),
+            "bulges": -bulges if flip else bulges, "closed": closed}
+
+def _arc_data(entity, layer: str) -> Dict[str, Any]:
+    """ARC with WCS center and WCS counter-clockwise start/end angles (degrees)."""
+    c = entity.ocs().to_wcs(entity.dxf.center)
+    s, t = entity.start_point, entity.end_point    # already WCS
+    a0 = math.degrees(math.atan2(s.y - c.y, s.x - c.x)) % 360.0
+    a1 = math.degrees(math.atan2(t.y - c.y, t.x - c.x)) % 360.0
+    if _mirrored(entity):
+        a0, a1 = a1, a0
+    return {"layer": layer, "center": (c.x, c.y), "r": entity.dxf.radius,
+            "start_angle": a0, "end_angle": a1, "handle": _handle(entity)}
+
+def _collect_wire(entity, prims: Dict[str, List[DXFPrimitive]], layer: str) -> bool:
+    """Collect LINE / ARC / LWPOLYLINE / POLYLINE as wire primitives; returns False for other types."""
+    dxft = entity.dxftype()
+    if dxft == "LINE":
+        p1 = Point(entity.dxf.start.x, entity.dxf.start.y)
+        p2 = Point(entity.dxf.end.x,   entity.dxf.end.y)
+        prims["LINE"].append(DXFPrimitive("LINE", {"layer": layer, "segment": Segment(p1, p2),
+                                                   "handle": _handle(entity)}))
+    elif dxft == "ARC":
+        prims["ARC"].append(DXFPrimitive("ARC", _arc_data(entity, layer)))
+    elif dxft in ("LWPOLYLINE", "POLYLINE"):
+        # 多段线直接保留顶点数组与凸度，由 graph_builder 批量拆成线段
+        data = _polyline_data(entity, layer)
+        if data is not None:
+            prims[dxft].append(DXFPrimitive(dxft, data))
+    else:
+        return False
+    return True
+
 def _collect_insert(entity, prims: Dict[str, List[DXFPrimitive]], symbol_matcher: SymbolMatcher, layer: str):
     """Collect this INSERT itself (as a symbol)"""
     name = entity.dxf.name if hasattr(entity.dxf, "name") else getattr(entity, "name", "")
@@ -30,42 +96,42 @@ def _collect_from_virtual(insert_ent, prims: Dict[str, List[DXFPrimitive]], symb
     """
     Expand nested content of an INSERT using virtual_entities().
     All returned entities are already transformed到WCS（带上父块的平移/旋转/缩放）。
+    Only LINEs inside blocks count as wires; block ARCs / polylines are symbol outlines
+    (e.g. a CT circle drawn as two half arcs) and would create false loops / open ends.
     """
     try:
-        for ve in insert_ent.virtual_entities():
-            lyr = ve.dxf.layer if hasattr(ve, "dxf") else ""
-            if not _layer_ok(lyr, layers_include, layers_exclude):
-                continue
-            dxft = ve.dxftype()
-            if dxft == "INSERT":
-                # 子块（递归）：记作一个独立的 INSERT，方便 symbols.patterns 匹配（如“接地/接地2 …”）
-                _collect_insert(ve, prims, symbol_matcher, lyr)
-                # 继续向下展开（有的图库会多层嵌套）
-                _collect_from_virtual(ve, prims, symbol_matcher, layers_include, layers_exclude)
-
-            elif dxft in ("TEXT", "MTEXT"):
-                # 把块内文字也拉出来，便于“文字驱动识别”
-                try:
-                    txt = ve.dxf.text if dxft == "TEXT" else ve.text
-                except Exception:
-                    txt = getattr(ve.dxf, "text", "")
-                pos = (ve.dxf.insert.x, ve.dxf.insert.y) if hasattr(ve.dxf, "insert") else (0.0, 0.0)
-                prims["TEXT"].append(DXFPrimitive("TEXT", {"layer": lyr, "text": txt, "pos": pos}))
-
-            elif dxft == "LINE":
-                p1 = Point(ve.dxf.start.x, ve.dxf.start.y)
-                p2 = Point(ve.dxf.end.x,  ve.dxf.end.y)
-                prims["LINE"].append(DXFPrimitive("LINE", {"layer": lyr, "segment": Segment(p1, p2)}))
-
-            # 需要的话可继续支持 ARC/CIRCLE 等
+        ves = list(insert_ent.virtual_entities())
     except Exception:
         # 某些旧版DXF/代理实体可能不支持virtual_entities，忽略即可
-        pass
+        return
+    for ve in ves:
+        lyr = ve.dxf.layer if hasattr(ve, "dxf") else ""
+        if not _layer_ok(lyr, layers_include, layers_exclude):
+            continue
+        dxft = ve.dxftype()
+        if dxft == "INSERT":
+            # 子块（递归）：记作一个独立的 INSERT，方便 symbols.patterns 匹配（如“接地/接地2 …”）
+            _collect_insert(ve, prims, symbol_matcher, lyr)
+            # 继续向下展开（有的图库会多层嵌套）
+            _collect_from_virtual(ve, prims, symbol_matcher, layers_include, layers_exclude)
+
+        elif dxft in ("TEXT", "MTEXT"):
+            # 把块内文字也拉出来，便于“文字驱动识别”
+            try:
+                txt = ve.dxf.text if dxft == "TEXT" else ve.text
+            except Exception:
+                txt = getattr(ve.dxf, "text", "")
+            pos = (ve.dxf.insert.x, ve.dxf.insert.y) if hasattr(ve.dxf, "insert") else (0.0, 0.0)
+            prims["TEXT"].append(DXFPrimitive("TEXT", {"layer": lyr, "text": txt, "pos": pos}))
+
+        elif dxft == "LINE":
+            _collect_wire(ve, prims, lyr)
 
 def parse_dxf(path: str, layers_include: list, layers_exclude: list, symbol_matcher: SymbolMatcher) -> Dict[str, List[DXFPrimitive]]:
     doc = ezdxf.readfile(path)
     msp = doc.modelspace()
-    prims: Dict[str, List[DXFPrimitive]] = {"LINE": [], "INSERT": [], "TEXT": [], "ARC": []}
+    prims: Dict[str, List[DXFPrimitive]] = {"LINE": [], "INSERT": [], "TEXT": [], "ARC": [],
+                                            "LWPOLYLINE": [], "POLYLINE": []}
 
     for e in msp:
         layer = e.dxf.layer if hasattr(e, "dxf") else ""
@@ -74,18 +140,10 @@ def parse_dxf(path: str, layers_include: list, layers_exclude: list, symbol_matc
 
         dxft = e.dxftype()
 
-        if dxft == "LINE":
-            p1 = Point(e.dxf.start.x, e.dxf.start.y)
-            p2 = Point(e.dxf.end.x,   e.dxf.end.y)
-            prims["LINE"].append(DXFPrimitive("LINE", {"layer": layer, "segment": Segment(p1, p2)}))
-
-        elif dxft == "ARC":
-            center = e.dxf.center
-            prims["ARC"].append(DXFPrimitive("ARC", {"layer": layer, "center": (center.x, center.y),
-                                                     "r": e.dxf.radius, "start_angle": e.dxf.start_angle,
-                                                     "end_angle": e.dxf.end_angle}))
+        if _collect_wire(e, prims, layer):
+            continue
 
-        elif dxft == "INSERT":
+        if dxft == "INSERT":
             # 先收顶层 INSERT（CT 会在这里命中）
             _collect_insert(e, prims, symbol_matcher, layer)
             # 再展开子实体（GROUND 常常在这一步命中）
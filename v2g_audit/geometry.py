@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Tuple, List, Optional
 import math
+import numpy as np
 
 @dataclass(frozen=True)
 class Point:
@@ -63,4 +64,26 @@ def mid_cross_without_junction(s1: Segment, s2: Segment, tau: float) -> bool:
     if ip is None:
         return False
     # If intersection is far from all endpoints -> likely mid-crossing
-    return (not is_endpoint(ip, s1, tau)) and (not is_endpoint(ip, s2, tau))
\ No newline at end of file
+    return (not is_endpoint(ip, s1, tau)) and (not is_endpoint(ip, s2, tau))
+
+def arc_endpoints(centers: np.ndarray, radii: np.ndarray, start_deg: np.ndarray, end_deg: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Bulk start/end points of DXF ARCs (angles in degrees, counter-clockwise)
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    radii = np.asarray(radii, dtype=float)[:, None]
+    a0 = np.radians(np.asarray(start_deg, dtype=float))
+    a1 = np.radians(np.asarray(end_deg, dtype=float))
+    starts = centers + radii * np.stack([np.cos(a0), np.sin(a0)], axis=1)
+    ends = centers + radii * np.stack([np.cos(a1), np.sin(a1)], axis=1)
+    return starts, ends
+
+def polyline_segments(points: np.ndarray, bulges: np.ndarray, closed: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Split a vertex array into consecutive segments; bulge i belongs to segment i -> i+1
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    bulges = np.asarray(bulges, dtype=float).reshape(-1)
+    if len(points) < 2:
+        empty = np.empty((0, 2))
+        return empty, empty, np.empty(0)
+    nxt = np.roll(points, -1, axis=0)
+    if not closed:
+        return points[:-1], nxt[:-1], bulges[:-1]
+    return points, nxt, bulges
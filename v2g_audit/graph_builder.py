@@ -1,7 +1,11 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Optional
 from dataclasses import dataclass
 from collections import defaultdict
-from .geometry import Point, Segment, dist, mid_cross_without_junction, is_endpoint
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import minimum_spanning_tree, connected_components
+from .geometry import Point, Segment, dist, mid_cross_without_junction, is_endpoint, arc_endpoints, polyline_segments
 from .symbols import SymbolMatcher
 
 @dataclass
@@ -18,6 +22,8 @@ class Edge:
     v: str
     attrs: Dict[str, Any]
 
+ENDPOINT_CLUSTERING = ("greedy", "single_linkage")
+
 def _cluster_points(points: List[Point], tau: float) -> List[Point]:
     # Simple agglomerative clustering by distance threshold
     clusters = []
@@ -33,38 +39,131 @@ def _cluster_points(points: List[Point], tau: float) -> List[Point]:
             clusters.append(p)
     return clusters
 
-def build_property_graph(prims: Dict[str, List[Any]], symbol_matcher: SymbolMatcher, tau_endpoint: float, tau_junction: float, attach_dist: float):
+def endpoint_merge_tree(points: np.ndarray, max_tau: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Single-linkage merge tree of the endpoints, as MST edges (u, v, height) sorted by height.
+    Built from KD-tree neighbour pairs within max_tau, so it is exact for every cut tau <= max_tau.
+    """
+    n = len(points)
+    empty = (np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0))
+    if n < 2:
+        return empty
+    pairs = cKDTree(points).query_pairs(max_tau, output_type="ndarray")
+    if len(pairs) == 0:
+        return empty
+    w = np.linalg.norm(points[pairs[:, 0]] - points[pairs[:, 1]], axis=1)
+    # csgraph treats 0 as "no edge"; a constant offset keeps coincident endpoints linked
+    # and does not change which spanning tree is minimal
+    mst = minimum_spanning_tree(coo_matrix((w + 1.0, (pairs[:, 0], pairs[:, 1])), shape=(n, n)).tocsr()).tocoo()
+    u, v = mst.row, mst.col
+    h = np.linalg.norm(points[u] - points[v], axis=1)
+    order = np.argsort(h, kind="stable")
+    return u[order], v[order], h[order]
+
+def cut_merge_tree(n: int, tree: Tuple[np.ndarray, np.ndarray, np.ndarray], tau: float) -> np.ndarray:
+    """Cluster labels (0..C-1, numbered by first appearance) for all endpoints merged at distance <= tau."""
+    if n == 0:
+        return np.empty(0, dtype=int)
+    u, v, h = tree
+    k = int(np.searchsorted(h, tau, side="right"))
+    adj = coo_matrix((np.ones(k), (u[:k], v[:k])), shape=(n, n))
+    _, labels = connected_components(adj, directed=False)
+    uniq, first = np.unique(labels, return_index=True)
+    remap = np.empty(len(uniq), dtype=int)
+    remap[uniq[np.argsort(first)]] = np.arange(len(uniq))
+    return remap[labels]
+
+def _wire_segments(prims: Dict[str, List[Any]]) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+    """
+    Flatten LINE / LWPOLYLINE / POLYLINE / ARC primitives into segment arrays.
+    Returns (starts (N,2), ends (N,2), per-segment edge attrs carrying the source entity).
+    """
+    starts, ends, meta = [], [], []
+
+    lines = prims.get("LINE", [])
+    if lines:
+        starts.append(np.array([[p.data["segment"].p1.x, p.data["segment"].p1.y] for p in lines], dtype=float))
+        ends.append(np.array([[p.data["segment"].p2.x, p.data["segment"].p2.y] for p in lines], dtype=float))
+        meta.extend({"kind": "WIRE", "entity": "LINE", "handle": p.data.get("handle")} for p in lines)
+
+    for kind in ("LWPOLYLINE", "POLYLINE"):
+        for p in prims.get(kind, []):
+            a, b, bulges = polyline_segments(p.data["points"], p.data["bulges"], p.data["closed"])
+            starts.append(a)
+            ends.append(b)
+            for bulge in bulges:
+                attrs = {"kind": "WIRE", "entity": kind, "handle": p.data.get("handle")}
+                if bulge != 0.0:
+                    attrs["bulge"] = float(bulge)
+                meta.append(attrs)
+
+    arcs = prims.get("ARC", [])
+    if arcs:
+        a, b = arc_endpoints(np.array([p.data["center"] for p in arcs], dtype=float),
+                             np.array([p.data["r"] for p in arcs], dtype=float),
+                             np.array([p.data["start_angle"] for p in arcs], dtype=float),
+                             np.array([p.data["end_angle"] for p in arcs], dtype=float))
+        starts.append(a)
+        ends.append(b)
+        meta.extend({"kind": "WIRE", "entity": "ARC", "handle": p.data.get("handle")} for p in arcs)
+
+    if not starts:
+        return np.empty((0, 2)), np.empty((0, 2)), []
+    return np.concatenate(starts), np.concatenate(ends), meta
+
+def wire_endpoints(prims: Dict[str, List[Any]]) -> np.ndarray:
+    """All wire endpoints as a (2N,2) array in segment order: start0, end0, start1, end1, ..."""
+    starts, ends, _ = _wire_segments(prims)
+    return np.stack([starts, ends], axis=1).reshape(-1, 2)
+
+def build_property_graph(prims: Dict[str, List[Any]], symbol_matcher: SymbolMatcher, tau_endpoint: float, tau_junction: float, attach_dist: float,
+                         endpoint_labels: Optional[np.ndarray] = None, endpoint_clustering: str = "greedy"):
+    """
+    endpoint_clustering: "greedy" (default) snaps each endpoint to the first cluster within tau_endpoint;
+    "single_linkage" merges every chain of endpoints spaced within tau_endpoint (the clustering
+    tolerance_sweep cuts), placing the node at the members' mean.
+    endpoint_labels: optional precomputed single-linkage cut per wire_endpoints() row (0..C-1);
+    when given, tau_endpoint and endpoint_clustering are not used.
+    """
+    if endpoint_clustering not in ENDPOINT_CLUSTERING:
+        raise ValueError(f"endpoint_clustering must be one of {ENDPOINT_CLUSTERING}, got {endpoint_clustering!r}")
     nodes: List[Node] = []
     edges: List[Edge] = []
 
-    # 1) Collect wire endpoints
-    lines = [p.data["segment"] for p in prims.get("LINE", [])]
-    endpoints = []
-    for s in lines:
-        endpoints.extend([s.p1, s.p2])
-    clusters = _cluster_points(endpoints, tau_endpoint)
+    # 1) Collect wire endpoints (LINE, polyline segments and arcs share one clustering)
+    starts, ends, seg_attrs = _wire_segments(prims)
+    pts = np.stack([starts, ends], axis=1).reshape(-1, 2)
+    if endpoint_labels is None and endpoint_clustering == "single_linkage":
+        endpoint_labels = cut_merge_tree(len(pts), endpoint_merge_tree(pts, tau_endpoint), tau_endpoint)
+    if endpoint_labels is not None:
+        labels = np.asarray(endpoint_labels, dtype=int)
+        n_clusters = int(labels.max()) + 1 if len(labels) else 0
+        counts = np.bincount(labels, minlength=n_clusters)
+        cx = np.bincount(labels, weights=pts[:, 0], minlength=n_clusters) / counts
+        cy = np.bincount(labels, weights=pts[:, 1], minlength=n_clusters) / counts
+        clusters = [Point(float(x), float(y)) for x, y in zip(cx, cy)]
+    else:
+        clusters = _cluster_points([Point(float(x), float(y)) for x, y in pts], tau_endpoint)
 
     # 2) Create endpoint nodes
     for i, p in enumerate(clusters):
         nodes.append(Node(id=f"EP{i}", type="ENDPOINT", x=p.x, y=p.y, attrs={}))
 
-    # 3) Map raw endpoints to nearest cluster
-    def nearest_cluster(p: Point) -> int:
-        dmin, idx = 1e18, -1
-        for i, c in enumerate(clusters):
-            d = dist(p, c)
-            if d < dmin:
-                dmin, idx = d, i
-        return idx
+    # 3) Map raw endpoints to their cluster (labels directly, or bulk KD-tree nearest query)
+    if endpoint_labels is not None:
+        a_idx, b_idx = labels[0::2], labels[1::2]
+    elif clusters:
+        tree = cKDTree(np.array([[c.x, c.y] for c in clusters], dtype=float))
+        _, a_idx = tree.query(starts)
+        _, b_idx = tree.query(ends)
+    else:
+        a_idx = b_idx = np.empty(0, dtype=int)
 
     # 4) Visual crossing filter & edges
-    for seg in lines:
-        a_idx = nearest_cluster(seg.p1)
-        b_idx = nearest_cluster(seg.p2)
-        if a_idx == b_idx:
+    for a, b, attrs in zip(a_idx.tolist(), b_idx.tolist(), seg_attrs):
+        if a == b:
             continue
-        e = Edge(u=f"EP{a_idx}", v=f"EP{b_idx}", attrs={"kind": "WIRE"})
-        edges.append(e)
+        edges.append(Edge(u=f"EP{a}", v=f"EP{b}", attrs=attrs))
 
     # TODO: mid-cross filter: ignore crossings that are not at endpoints unless a JUNCTION exists
     # For simplicity in this minimal version, we already only connect endpoints (not mid-cross),
@@ -0,0 +1,210 @@
+from typing import Dict, Any, List, Tuple, Optional, Iterable
+import json, os, re, sqlite3
+from .gsp_verify import GSPVerifier
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS drawings (
+    id    INTEGER PRIMARY KEY,
+    name  TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    id          INTEGER PRIMARY KEY,          -- shared with node_rtree.id
+    drawing_id  INTEGER NOT NULL REFERENCES drawings(id) ON DELETE CASCADE,
+    node_id     TEXT NOT NULL,
+    type        TEXT NOT NULL,
+    x           REAL NOT NULL,
+    y           REAL NOT NULL,
+    attrs       TEXT NOT NULL,
+    UNIQUE (drawing_id, node_id)
+);
+CREATE TABLE IF NOT EXISTS edges (
+    drawing_id  INTEGER NOT NULL REFERENCES drawings(id) ON DELETE CASCADE,
+    u           TEXT NOT NULL,
+    v           TEXT NOT NULL,
+    kind        TEXT,
+    attrs       TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS node_texts (
+    drawing_id  INTEGER NOT NULL REFERENCES drawings(id) ON DELETE CASCADE,
+    node_id     TEXT NOT NULL,
+    text        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS text_tokens (
+    drawing_id  INTEGER NOT NULL REFERENCES drawings(id) ON DELETE CASCADE,
+    node_id     TEXT NOT NULL,
+    token       TEXT NOT NULL
+);
+-- drawing id is the first R-tree dimension, so a range probe never returns other drawings' nodes
+CREATE VIRTUAL TABLE IF NOT EXISTS node_rtree USING rtree(id, min_d, max_d, min_x, max_x, min_y, max_y);
+CREATE INDEX IF NOT EXISTS idx_nodes_drawing ON nodes(drawing_id);
+CREATE INDEX IF NOT EXISTS idx_nodes_type ON nodes(type, drawing_id);
+CREATE INDEX IF NOT EXISTS idx_edges_drawing ON edges(drawing_id);
+CREATE INDEX IF NOT EXISTS idx_node_texts_node ON node_texts(drawing_id, node_id);
+DROP INDEX IF EXISTS idx_text_tokens_token;
+CREATE INDEX IF NOT EXISTS idx_text_tokens_lookup ON text_tokens(token, drawing_id, node_id);
+"""
+
+_TOKEN = re.compile(r"\w+")
+
+def _tokens(text: str) -> List[str]:
+    return sorted(set(_TOKEN.findall((text or "").lower())))
+
+class GraphStore:
+    """
+    Local SQLite store for property graphs from build_property_graph, one row set per drawing.
+    Node coordinates are indexed in an R-tree so cross-drawing proximity queries avoid loading graph.json files.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- writing ----------
+    def add_graph(self, drawing: str, graph: Dict[str, Any]) -> int:
+        """Bulk insert (or replace) one drawing's nodes, edges and attached texts. Returns the drawing id."""
+        with self.conn:
+            self._delete(drawing)
+            did = self.conn.execute("INSERT INTO drawings(name) VALUES (?)", (drawing,)).lastrowid
+            base = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM nodes").fetchone()[0] + 1
+            node_rows, rtree_rows, text_rows, token_rows = [], [], [], []
+            for i, n in enumerate(graph["nodes"]):
+                rid = base + i
+                attrs = n.get("attrs", {})
+                node_rows.append((rid, did, n["id"], n["type"], n["x"], n["y"], json.dumps(attrs, ensure_ascii=False)))
+                rtree_rows.append((rid, did, did, n["x"], n["x"], n["y"], n["y"]))
+                texts = attrs.get("texts", [])
+                text_rows.extend((did, n["id"], t) for t in texts)
+                token_rows.extend((did, n["id"], tok) for tok in sorted({tok for t in texts for tok in _tokens(t)}))
+            self.conn.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?)", node_rows)
+            self.conn.executemany("INSERT INTO node_rtree VALUES (?, ?, ?, ?, ?, ?, ?)", rtree_rows)
+            self.conn.executemany("INSERT INTO node_texts VALUES (?, ?, ?)", text_rows)
+            self.conn.executemany("INSERT INTO text_tokens VALUES (?, ?, ?)", token_rows)
+            self.conn.executemany(
+                "INSERT INTO edges VALUES (?, ?, ?, ?, ?)",
+                ((did, e["u"], e["v"], e["attrs"].get("kind"), json.dumps(e["attrs"], ensure_ascii=False))
+                 for e in graph["edges"]))
+        return did
+
+    def add_graph_file(self, path: str, drawing: Optional[str] = None) -> int:
+        """Import an existing graph.json; the drawing name defaults to its parent directory."""
+        with open(path, "r", encoding="utf-8") as f:
+            graph = json.load(f)
+        name = drawing or os.path.basename(os.path.dirname(os.path.abspath(path)))
+        return self.add_graph(name, graph)
+
+    def _delete(self, drawing: str):
+        row = self.conn.execute("SELECT id FROM drawings WHERE name = ?", (drawing,)).fetchone()
+        if row is None:
+            return
+        self.conn.execute("DELETE FROM node_rtree WHERE id IN (SELECT id FROM nodes WHERE drawing_id = ?)", row)
+        self.conn.execute("DELETE FROM drawings WHERE id = ?", row)
+
+    # ---------- querying ----------
+    def drawings(self) -> List[str]:
+        return [r[0] for r in self.conn.execute("SELECT name FROM drawings ORDER BY name")]
+
+    def _find_nodes_sql(self, type: Optional[str] = None, drawing: Optional[str] = None, token: Optional[str] = None,
+                        bbox: Optional[Tuple[float, float, float, float]] = None) -> Tuple[str, List[Any]]:
+        # Pick the most selective driver: token index, else R-tree probe, else the nodes table
+        cols = "SELECT DISTINCT d.name, n.node_id, n.type, n.x, n.y, n.attrs"
+        where, params = [], []
+        if token is not None:
+            sql = [f"{cols} FROM text_tokens t CROSS JOIN nodes n ON n.drawing_id = t.drawing_id "
+                   "AND n.node_id = t.node_id CROSS JOIN drawings d ON d.id = n.drawing_id"]
+            where.append("t.token = ?"); params.append(token.lower())
+            if drawing is not None:
+                where.append("t.drawing_id = (SELECT id FROM drawings WHERE name = ?)"); params.append(drawing)
+        elif bbox is not None:
+            # R-tree boxes are float32 rounded outwards: probe for overlap, then test the exact coordinates
+            sql = [f"{cols} FROM node_rtree r CROSS JOIN nodes n ON n.id = r.id JOIN drawings d ON d.id = n.drawing_id"]
+            where.append("r.max_x >= ? AND r.min_x <= ? AND r.max_y >= ? AND r.min_y <= ?")
+            params.extend([bbox[0], bbox[2], bbox[1], bbox[3]])
+            if drawing is not None:
+                where.append("r.min_d <= (SELECT id FROM drawings WHERE name = ?) "
+                             "AND r.max_d >= (SELECT id FROM drawings WHERE name = ?)")
+                params.extend([drawing, drawing])
+        else:
+            sql = [f"{cols} FROM nodes n JOIN drawings d ON d.id = n.drawing_id"]
+        if bbox is not None:
+            where.append("n.x >= ? AND n.x <= ? AND n.y >= ? AND n.y <= ?")
+            params.extend([bbox[0], bbox[2], bbox[1], bbox[3]])
+        if type is not None:
+            where.append("n.type = ?"); params.append(type)
+        if drawing is not None:
+            where.append("d.name = ?"); params.append(drawing)
+        if where:
+            sql.append("WHERE " + " AND ".join(where))
+        return " ".join(sql), params
+
+    def find_nodes(self, type: Optional[str] = None, drawing: Optional[str] = None, token: Optional[str] = None,
+                   bbox: Optional[Tuple[float, float, float, float]] = None) -> List[Dict[str, Any]]:
+        """Nodes filtered by type, drawing, text token and/or bbox (min_x, min_y, max_x, max_y), box edges inclusive."""
+        sql, params = self._find_nodes_sql(type, drawing, token, bbox)
+        return [{"drawing": d, "id": nid, "type": t, "x": x, "y": y, "attrs": json.loads(a)}
+                for d, nid, t, x, y, a in self.conn.execute(sql, params)]
+
+    def nodes_near(self, type: str, anchor_type: str, radius: float,
+                   drawings: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        All `type` nodes within `radius` of any `anchor_type` node of the same drawing,
+        e.g. nodes_near("GROUND", "CT", 20.0). Anchors drive the loop; each one probes the R-tree
+        for its own drawing and box, and only those candidates get the exact distance test.
+        """
+        anchors = "a.type = :anchor"
+        params: Dict[str, Any] = {"r": radius, "anchor": anchor_type, "type": type}
+        if drawings is not None:
+            names = list(drawings)
+            anchors += " AND a.drawing_id IN (SELECT id FROM drawings WHERE name IN (%s))" % \
+                       ", ".join(f":d{i}" for i in range(len(names)))
+            params.update({f"d{i}": name for i, name in enumerate(names)})
+        # CROSS JOIN pins the order: anchors -> R-tree range probe -> candidate node by rowid
+        sql = f"""
+            SELECT d.name, n.node_id, a.node_id,
+                   ((n.x - a.x) * (n.x - a.x) + (n.y - a.y) * (n.y - a.y)) AS d2
+            FROM nodes a
+            CROSS JOIN node_rtree r
+            CROSS JOIN nodes n
+            JOIN drawings d ON d.id = a.drawing_id
+            WHERE {anchors}
+              AND r.min_d <= a.drawing_id AND r.max_d >= a.drawing_id
+              AND r.min_x <= a.x + :r AND r.max_x >= a.x - :r
+              AND r.min_y <= a.y + :r AND r.max_y >= a.y - :r
+              AND n.id = r.id AND n.type = :type AND d2 <= :r * :r
+        """
+        return [{"drawing": d, "id": nid, "anchor": aid, "distance": d2 ** 0.5}
+                for d, nid, aid, d2 in self.conn.execute(sql, params)]
+
+    # ---------- loading ----------
+    def load_graph(self, drawing: str, node_where: Optional[str] = None, params: Iterable[Any] = ()) -> Dict[str, Any]:
+        """
+        Rebuild a graph dict (build_property_graph format) for one drawing.
+        `node_where` is an optional SQL condition on the nodes table (alias n), e.g. "n.type IN ('CT', 'GROUND')";
+        only edges with both ends in the selection are kept.
+        """
+        sql = ("SELECT n.node_id, n.type, n.x, n.y, n.attrs FROM nodes n JOIN drawings d ON d.id = n.drawing_id "
+               "WHERE d.name = ?")
+        if node_where:
+            sql += f" AND ({node_where})"
+        nodes = [{"id": nid, "type": t, "x": x, "y": y, "attrs": json.loads(a)}
+                 for nid, t, x, y, a in self.conn.execute(sql, [drawing, *params])]
+        keep = {n["id"] for n in nodes}
+        edges = [{"u": u, "v": v, "attrs": json.loads(a)}
+                 for u, v, a in self.conn.execute(
+                     "SELECT e.u, e.v, e.attrs FROM edges e JOIN drawings d ON d.id = e.drawing_id WHERE d.name = ?",
+                     (drawing,))
+                 if u in keep and v in keep]
+        return {"nodes": nodes, "edges": edges}
+
+    def load_verifier(self, drawing: str, node_where: Optional[str] = None, params: Iterable[Any] = ()) -> GSPVerifier:
+        """GSPVerifier over load_graph(...), ready for RuleEngine."""
+        return GSPVerifier(self.load_graph(drawing, node_where, params))
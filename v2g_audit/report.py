@@ -13,4 +13,49 @@ def write_reports(graph: Dict[str, Any], results: Dict[str, Any], outdir: str):
         status = "PASS" if r.get("status") else "FAIL"
         lines.append(f"[{status}] {r.get('function')} @ {r.get('region')}: {r.get('detail')}")
     with open(os.path.join(outdir, "report.txt"), "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
\ No newline at end of file
+        f.write("\n".join(lines))
+
+def write_variant_reports(evaluation: Dict[str, Any], outdir: str):
+    """Base reports in outdir, one sub-directory per variant, plus invariance.json / invariance.txt."""
+    write_reports(evaluation["base"]["graph"], evaluation["base"]["results"], outdir)
+    for v in evaluation["variants"]:
+        vdir = os.path.join(outdir, "variants", f"v{v['variant']:03d}")
+        write_reports(v["graph"], v["results"], vdir)
+        spec = {k: v[k] for k in ("variant", "angle", "shift", "noise")}
+        with open(os.path.join(vdir, "variant.json"), "w", encoding="utf-8") as f:
+            json.dump(spec, f, ensure_ascii=False, indent=2)
+    inv = evaluation["invariance"]
+    with open(os.path.join(outdir, "invariance.json"), "w", encoding="utf-8") as f:
+        json.dump(inv, f, ensure_ascii=False, indent=2)
+    lines = []
+    for r in inv["rules"]:
+        flag = "STABLE" if r["invariant"] else "UNSTABLE"
+        lines.append(f"[{flag}] {r['rule']}: base={'PASS' if r['base_status'] else 'FAIL'}, "
+                     f"variants pass={r['pass']} fail={r['fail']}, flipped={r['flipped_variants']}")
+    with open(os.path.join(outdir, "invariance.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def write_sweep_report(sweep: Dict[str, Any], outdir: str):
+    """sweep.json with every cut, and a sweep.txt table of counts / verdicts per tau."""
+    os.makedirs(outdir, exist_ok=True)
+    with open(os.path.join(outdir, "sweep.json"), "w", encoding="utf-8") as f:
+        json.dump(sweep, f, ensure_ascii=False, indent=2)
+    lines = [f"endpoint clustering: {sweep['clustering']} "
+             f"(use tolerance.endpoint_clustering: {sweep['clustering']} to reproduce these cuts)"]
+    for s in sweep["steps"]:
+        verdicts = ", ".join(f"{k}={'PASS' if v else 'FAIL'}" for k, v in s["verdicts"].items())
+        lines.append(f"tau={s['tau']:g}: nodes={s['nodes']} edges={s['edges']} components={s['components']} | {verdicts}")
+    lines.append("")
+    for p in sweep["plateaus"]:
+        lo, hi = p["stable_interval"]
+        upper = f"{hi:g})" if hi is not None else "?) unbounded above the swept range"
+        note = " [wires collapsed]" if p["collapsed"] else ""
+        lines.append(f"stable for tau in [{lo:g}, {upper}: nodes={p['nodes']} edges={p['edges']} "
+                     f"components={p['components']}{note}")
+    if sweep["recommended_tau"] is not None:
+        lines.append(f"recommended tau_endpoint_snap: {sweep['recommended_tau']:g}")
+    else:
+        lines.append("no bounded, non-collapsed plateau: extend the tau range")
+    with open(os.path.join(outdir, "sweep.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
@@ -0,0 +1,86 @@
+from typing import Dict, Any, List, Tuple, Optional
+import math
+import numpy as np
+import networkx as nx
+from .dxf_parser import DXFPrimitive
+from .symbols import SymbolMatcher
+from .graph_builder import build_property_graph, wire_endpoints, endpoint_merge_tree, cut_merge_tree
+from .gsp_verify import GSPVerifier
+from .rules import RuleEngine
+
+def _stable_interval(heights: np.ndarray, lo_tau: float, hi_tau: float) -> Tuple[float, Optional[float]]:
+    # Topology can only change at a merge height, so it is constant on [last height <= lo_tau, next height > hi_tau).
+    # The tree is truncated at the largest swept tau, so with no merge above hi_tau the upper bound is unknown (None).
+    below = heights[heights <= lo_tau]
+    above = heights[heights > hi_tau]
+    return (float(below[-1]) if len(below) else 0.0, float(above[0]) if len(above) else None)
+
+def sweep_tolerance(prims: Dict[str, List[DXFPrimitive]], matcher: SymbolMatcher, rules: Dict[str, Any],
+                    taus: List[float], tau_junction: float, attach_dist: float,
+                    max_collapse: float = 0.1) -> Dict[str, Any]:
+    """
+    Build the endpoint merge tree once, cut it at every tau and report graph size, connected components
+    and rule verdicts per cut. Cuts are single-linkage clusters: each equals
+    build_property_graph(..., tau, ..., endpoint_clustering="single_linkage"), not the default greedy snapping.
+    The recommended tau lies in the relatively widest (log-scale) bounded plateau in which at most
+    max_collapse of the wire segments have collapsed into self-loops.
+    """
+    taus = sorted(set(float(t) for t in taus))
+    if not taus or taus[0] <= 0:
+        raise ValueError("sweep_tolerance needs at least one tau, all > 0")
+    points = wire_endpoints(prims)
+    n_segments = len(points) // 2
+    tree = endpoint_merge_tree(points, taus[-1])
+
+    steps = []
+    for tau in taus:
+        labels = cut_merge_tree(len(points), tree, tau)
+        graph = build_property_graph(prims, matcher, tau, tau_junction, attach_dist, endpoint_labels=labels)
+        verifier = GSPVerifier(graph)
+        results = RuleEngine(verifier).run(rules)["results"]
+        steps.append({
+            "tau": tau,
+            "endpoint_clusters": int(labels.max()) + 1 if len(labels) else 0,
+            "nodes": len(graph["nodes"]),
+            "edges": len(graph["edges"]),
+            "wire_edges": sum(1 for e in graph["edges"] if e["attrs"].get("kind") == "WIRE"),
+            "components": nx.number_connected_components(verifier.G),
+            "verdicts": {f"{r.get('function')}@{r.get('region')}": bool(r.get("status")) for r in results},
+            "results": results,
+        })
+
+    # group consecutive taus with identical topology and verdicts
+    def signature(s):
+        return (s["nodes"], s["edges"], s["components"], tuple(sorted(s["verdicts"].items())))
+
+    plateaus = []
+    for s in steps:
+        if plateaus and signature(plateaus[-1][-1]) == signature(s):
+            plateaus[-1].append(s)
+        else:
+            plateaus.append([s])
+    summary = []
+    for p in plateaus:
+        lo, hi = _stable_interval(tree[2], p[0]["tau"], p[-1]["tau"])
+        wire_edges = p[0]["wire_edges"]
+        collapsed = wire_edges == 0 or wire_edges < (1.0 - max_collapse) * n_segments
+        summary.append({"tau_min": p[0]["tau"], "tau_max": p[-1]["tau"], "stable_interval": [lo, hi],
+                        "bounded": hi is not None, "collapsed": collapsed,
+                        "nodes": p[0]["nodes"], "edges": p[0]["edges"], "wire_edges": wire_edges,
+                        "components": p[0]["components"], "verdicts": p[0]["verdicts"]})
+
+    # rank by relative width; the lowest plateau starts at 0, so floor it at the smallest swept tau
+    def log_width(p):
+        lo, hi = p["stable_interval"]
+        return math.log(hi / max(lo, taus[0]))
+
+    eligible = [p for p in summary if p["bounded"] and not p["collapsed"] and p["stable_interval"][1] > 0]
+    best = max(eligible, key=log_width) if eligible else None
+    return {
+        "clustering": "single_linkage",
+        "taus": taus,
+        "merge_heights": tree[2].tolist(),
+        "steps": steps,
+        "plateaus": summary,
+        "recommended_tau": math.sqrt(max(best["stable_interval"][0], taus[0]) * best["stable_interval"][1]) if best else None,
+    }
@@ -0,0 +1,104 @@
+from typing import Dict, Any, List, Tuple, Optional
+import numpy as np
+from .geometry import Point, Segment
+from .dxf_parser import DXFPrimitive
+from .symbols import SymbolMatcher
+from .graph_builder import build_property_graph
+from .gsp_verify import GSPVerifier
+from .rules import RuleEngine
+
+def _affine(points: np.ndarray, rot: np.ndarray, shift: np.ndarray, noise: float, rng: np.random.Generator) -> np.ndarray:
+    # p' = R p + t (+ gaussian jitter), applied to an (N,2) array in one go
+    out = points @ rot.T + shift
+    if noise > 0 and len(out):
+        out = out + rng.normal(0.0, noise, size=out.shape)
+    return out
+
+def transform_prims(prims: Dict[str, List[DXFPrimitive]], angle_deg: float, shift: Tuple[float, float],
+                    noise: float = 0.0, rng: Optional[np.random.Generator] = None) -> Dict[str, List[DXFPrimitive]]:
+    """
+    Rotate (about the origin), translate and jitter every primitive coordinate.
+    Returns a new primitive dict; the input is left untouched.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    th = np.radians(angle_deg)
+    rot = np.array([[np.cos(th), -np.sin(th)], [np.sin(th), np.cos(th)]])
+    t = np.asarray(shift, dtype=float)
+    out: Dict[str, List[DXFPrimitive]] = {k: [] for k in prims}
+
+    lines = prims.get("LINE", [])
+    if lines:
+        pts = np.array([[p.data["segment"].p1.x, p.data["segment"].p1.y,
+                         p.data["segment"].p2.x, p.data["segment"].p2.y] for p in lines], dtype=float)
+        pts = _affine(pts.reshape(-1, 2), rot, t, noise, rng).reshape(-1, 4)
+        for p, (x1, y1, x2, y2) in zip(lines, pts.tolist()):
+            out["LINE"].append(DXFPrimitive("LINE", {**p.data, "segment": Segment(Point(x1, y1), Point(x2, y2))}))
+
+    for kind in ("LWPOLYLINE", "POLYLINE"):
+        for p in prims.get(kind, []):
+            # bulges are invariant under rotation/translation
+            pts = _affine(np.asarray(p.data["points"], dtype=float), rot, t, noise, rng)
+            out[kind].append(DXFPrimitive(kind, {**p.data, "points": pts}))
+
+    arcs = prims.get("ARC", [])
+    if arcs:
+        centers = _affine(np.array([p.data["center"] for p in arcs], dtype=float), rot, t, noise, rng)
+        for p, (cx, cy) in zip(arcs, centers.tolist()):
+            out["ARC"].append(DXFPrimitive("ARC", {**p.data, "center": (cx, cy),
+                                                   "start_angle": (p.data["start_angle"] + angle_deg) % 360.0,
+                                                   "end_angle": (p.data["end_angle"] + angle_deg) % 360.0}))
+
+    for kind, key in (("INSERT", "insert"), ("TEXT", "pos")):
+        items = prims.get(kind, [])
+        if not items:
+            continue
+        pts = _affine(np.array([p.data[key] for p in items], dtype=float), rot, t, noise, rng)
+        for p, (x, y) in zip(items, pts.tolist()):
+            out[kind].append(DXFPrimitive(kind, {**p.data, key: (x, y)}))
+
+    return out
+
+def generate_variants(prims: Dict[str, List[DXFPrimitive]], n: int, seed: int = 0,
+                      max_shift: float = 100.0, noise: float = 0.0):
+    """Yield (spec, prims) for n random rotation/translation/noise variants of one parsed base case."""
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        angle = float(rng.uniform(0.0, 360.0))
+        shift = (float(rng.uniform(-max_shift, max_shift)), float(rng.uniform(-max_shift, max_shift)))
+        spec = {"variant": i, "angle": angle, "shift": list(shift), "noise": noise}
+        yield spec, transform_prims(prims, angle, shift, noise, rng)
+
+def invariance_summary(base: Dict[str, Any], variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per rule, count PASS/FAIL over all variants and flag rules whose verdict differs from the base case."""
+    rules = []
+    for i, r in enumerate(base["results"]):
+        ref = bool(r.get("status"))
+        vs = [bool(v["results"]["results"][i].get("status")) for v in variants]
+        flipped = [v["variant"] for v, s in zip(variants, vs) if s != ref]
+        rules.append({"rule": f"{r.get('function')}@{r.get('region')}", "base_status": ref,
+                      "pass": sum(vs), "fail": len(vs) - sum(vs),
+                      "invariant": not flipped, "flipped_variants": flipped})
+    return {"n_variants": len(variants), "rules": rules,
+            "unstable": [r["rule"] for r in rules if not r["invariant"]]}
+
+def evaluate_variants(prims: Dict[str, List[DXFPrimitive]], matcher: SymbolMatcher, rules: Dict[str, Any],
+                      tau_endpoint: float, tau_junction: float, attach_dist: float,
+                      n: int, seed: int = 0, max_shift: float = 100.0, noise: float = 0.0,
+                      endpoint_clustering: str = "greedy") -> Dict[str, Any]:
+    """
+    Build and verify the base case plus n in-memory variants (no re-parsing).
+    Returns {"base": {...}, "variants": [...], "invariance": {...}}; each entry keeps its graph and rule results.
+    """
+    def run(p):
+        graph = build_property_graph(p, matcher, tau_endpoint, tau_junction, attach_dist,
+                                     endpoint_clustering=endpoint_clustering)
+        return graph, RuleEngine(GSPVerifier(graph)).run(rules)
+
+    base_graph, base_results = run(prims)
+    variants = []
+    for spec, vp in generate_variants(prims, n, seed, max_shift, noise):
+        graph, results = run(vp)
+        variants.append({**spec, "graph": graph, "results": results})
+    return {"base": {"graph": base_graph, "results": base_results},
+            "variants": variants,
+            "invariance": invariance_summary(base_results, variants)}